@@ -3,8 +3,9 @@ Mitake SMS Python Library
 A Python wrapper for the Mitake SMS API
 """
 
-from .client import MitakeClient
+from .client import MitakeClient, get_session
+from .async_client import AsyncMitakeClient
 from .exceptions import MitakeError, AuthenticationError, APIError
 
 __version__ = "0.1.0"
-__all__ = ["MitakeClient", "MitakeError", "AuthenticationError", "APIError"]
\ No newline at end of file
+__all__ = ["MitakeClient", "AsyncMitakeClient", "get_session", "MitakeError", "AuthenticationError", "APIError"]
\ No newline at end of file
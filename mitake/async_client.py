@@ -0,0 +1,263 @@
+import asyncio
+import os
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from .client import (
+    MitakeClient, USER_AGENT, DEFAULT_TIMEOUT, _EP_SEND, _EP_BULK, _EP_QUERY, _EP_QUERY_GET,
+    _ENDPOINTS, _UTF8_CHARSET, _UTF8_POSTIN, _BATCH_HEADERS, _build_batch_data, _parse_content
+)
+from .exceptions import MitakeError, AuthenticationError, APIError
+
+
+class AsyncMitakeClient:
+    """Asynchronous Mitake SMS API Client (requires aiohttp)"""
+    
+    DEFAULT_BASE_URL = MitakeClient.DEFAULT_BASE_URL
+    DEFAULT_CONNECTION_LIMIT = 32
+    
+    def __init__(
+        self,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        base_url: Optional[str] = None,
+        limit: int = DEFAULT_CONNECTION_LIMIT
+    ):
+        """
+        Initialize asynchronous Mitake SMS client
+        
+        The HTTP session is opened by ``async with`` and shared by every
+        request made inside the block:
+        
+            async with AsyncMitakeClient(username, password) as client:
+                await client.send_sms("0912345678", "你好")
+        
+        Args:
+            username: Mitake username (or set MITAKE_USERNAME env var)
+            password: Mitake password (or set MITAKE_PASSWORD env var)
+            base_url: API base URL (defaults to https://smsapi.mitake.com.tw)
+            limit: Maximum number of concurrent connections to the API host
+                (defaults to 32)
+        """
+        if aiohttp is None:
+            raise MitakeError(
+                "aiohttp is required for AsyncMitakeClient. "
+                "Install it with: pip install mitake[async]"
+            )
+        
+        self._username = username or os.getenv('MITAKE_USERNAME')
+        self._password = password or os.getenv('MITAKE_PASSWORD')
+        self.base_url = base_url or self.DEFAULT_BASE_URL
+        self.limit = limit
+        
+        if not self._username or not self._password:
+            raise AuthenticationError(
+                "Username and password are required. "
+                "Set them via parameters or MITAKE_USERNAME/MITAKE_PASSWORD env vars."
+            )
+        
+        self._encode_auth()
+        
+        # endpoint -> full URL, built up front for the known endpoints
+        self._api_root = self.base_url.rstrip('/')
+        self._urls = {endpoint: f"{self._api_root}/{endpoint}" for endpoint in _ENDPOINTS}
+        
+        self._session = None
+    
+    @property
+    def username(self) -> str:
+        """Mitake username; assigning a new one applies to subsequent requests"""
+        return self._username
+    
+    @username.setter
+    def username(self, value: str) -> None:
+        self._username = value
+        self._encode_auth()
+    
+    @property
+    def password(self) -> str:
+        """Mitake password; assigning a new one applies to subsequent requests"""
+        return self._password
+    
+    @password.setter
+    def password(self, value: str) -> None:
+        self._password = value
+        self._encode_auth()
+    
+    def _encode_auth(self) -> None:
+        """Build the auth params once per credential change instead of per request"""
+        self._auth_params = MappingProxyType({
+            'username': self._username,
+            'password': self._password
+        })
+    
+    async def __aenter__(self) -> "AsyncMitakeClient":
+        # Entering again while a session is open reuses it rather than
+        # replacing (and leaking) the open connector
+        if self._session is not None and not self._session.closed:
+            return self
+        
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit,
+            keepalive_timeout=75,
+            ttl_dns_cache=300
+        )
+        connect_timeout, read_timeout = DEFAULT_TIMEOUT
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': USER_AGENT},
+            timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def _make_request(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        data: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Make HTTP request to Mitake API and return the response body"""
+        if self._session is None:
+            raise MitakeError(
+                "Client session is not open. Use 'async with AsyncMitakeClient(...)'."
+            )
+        
+        url = self._urls.get(endpoint) or f"{self._api_root}/{endpoint}"
+        
+        # Add authentication to requests (copied so the caller's dict is untouched)
+        params = {**(params or {}), **self._auth_params}
+        
+        if method.upper() != "POST":
+            # For GET requests, merge data into params
+            if isinstance(data, dict):
+                params.update(data)
+            data = None
+        
+        try:
+            async with self._session.request(
+                method, url, params=params, data=data, headers=headers
+            ) as r:
+                text = await r.text(encoding='utf-8')
+                
+                # Check for HTTP errors
+                if r.status >= 400:
+                    raise APIError(
+                        f"HTTP {r.status}: {text}",
+                        status_code=r.status,
+                        response_data=text
+                    )
+                
+                return text
+        
+        except aiohttp.ClientError as e:
+            raise MitakeError(f"Request failed: {str(e)}")
+    
+    def _parse_response(self, content: str) -> Dict[str, Any]:
+        """Parse Mitake API response"""
+        return _parse_content(content)
+    
+    async def send_sms(
+        self,
+        to: str,
+        message: str,
+        message_id: Optional[str] = None,
+        send_time: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Send SMS message
+        
+        See MitakeClient.send_sms for the meaning of the arguments.
+        
+        Returns:
+            Dict containing the API response
+        """
+        data = {
+            'dstaddr': to,
+            'smbody': message
+        }
+        
+        if message_id:
+            data['msgid'] = message_id
+        
+        if send_time:
+            data['dlvtime'] = send_time
+        
+        content = await self._make_request(_EP_SEND, method='POST', data=data, params=_UTF8_CHARSET)
+        return self._parse_response(content)
+    
+    async def send_many(self, messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Send several single SMS requests concurrently
+        
+        Args:
+            messages: List of dicts of send_sms keyword arguments
+                ('to', 'message' and optionally 'message_id', 'send_time')
+        
+        Returns:
+            List of API responses, in the same order as messages
+        """
+        return await asyncio.gather(*(self.send_sms(**m) for m in messages))
+    
+    async def send_batch_sms(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Send multiple SMS messages in one SmBulkSend request
+        
+        See MitakeClient.send_batch_sms for the message dict format.
+        
+        Returns:
+            Dict containing the API response
+        """
+        batch_data = _build_batch_data(messages)
+        
+        content = await self._make_request(
+            _EP_BULK, method='POST', data=batch_data, params=_UTF8_POSTIN, headers=_BATCH_HEADERS
+        )
+        return self._parse_response(content)
+    
+    async def query_account_balance(self) -> Dict[str, Any]:
+        """
+        Query account balance/points
+        
+        Returns:
+            Dict containing account balance information
+        """
+        content = await self._make_request(_EP_QUERY, method='GET')
+        return self._parse_response(content)
+    
+    async def query_message_status(self, message_ids: List[str]) -> Dict[str, Any]:
+        """
+        Query SMS message delivery status
+        
+        Args:
+            message_ids: List of message IDs to query
+        
+        Returns:
+            Dict containing message status information
+        """
+        if not message_ids:
+            raise ValueError("Message IDs list cannot be empty")
+        
+        # str.join also rejects non-string IDs with a TypeError
+        params = {
+            'msgid': ','.join(message_ids)
+        }
+        
+        content = await self._make_request(_EP_QUERY_GET, method='GET', params=params)
+        return self._parse_response(content)
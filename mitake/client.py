@@ -1,21 +1,217 @@
+import http.cookiejar
 import os
+import threading
+import time
 import requests
-from typing import Optional, Dict, Any, List, Union
+from requests.adapters import HTTPAdapter
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Iterator, List, Tuple, Union
 from urllib.parse import urlencode
+from urllib3.util.retry import Retry
 
 from .exceptions import MitakeError, AuthenticationError, APIError
 
 
+USER_AGENT = "mitake-py/0.1"
+
+# Field separator of the SmBulkSend batch format
+SEP = "$$"
+
+# API endpoints
+_EP_SEND = 'api/mtk/SmSend'
+_EP_BULK = 'api/mtk/SmBulkSend'
+_EP_QUERY = 'api/mtk/SmQuery'
+_EP_QUERY_GET = 'api/mtk/SmQueryGet'
+_ENDPOINTS = (_EP_SEND, _EP_BULK, _EP_QUERY, _EP_QUERY_GET)
+
+# UTF-8 encoding parameters, shared read-only by every request
+_UTF8_CHARSET = MappingProxyType({'CharsetURL': 'UTF8'})
+_UTF8_POSTIN = MappingProxyType({'Encoding_PostIn': 'UTF8'})
+
+# Batch bodies are sent pre-encoded as UTF-8 bytes
+_BATCH_HEADERS = MappingProxyType({'Content-Type': 'text/plain; charset=utf-8'})
+
+# (connect, read) timeout in seconds for requests sent without their own
+DEFAULT_TIMEOUT = (3.05, 30)
+
+# Process-wide sessions keyed by (base_url, pool_maxsize)
+_SHARED_SESSIONS: Dict[Tuple[str, int], requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies DEFAULT_TIMEOUT when the caller sets no timeout"""
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+        return super().send(
+            request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+        )
+
+
+def _new_pooled_session(pool_maxsize: int) -> requests.Session:
+    """Create a session with a keep-alive pool and retry policy for the API host"""
+    session = requests.Session()
+    
+    # Credentials are sent explicitly, so skip the per-request .netrc and
+    # environment proxy lookups; set session.proxies to use a proxy. This also
+    # ignores REQUESTS_CA_BUNDLE/CURL_CA_BUNDLE: set session.verify instead.
+    session.trust_env = False
+    
+    # The session is shared by every client (tenant) of the same host, so
+    # never store cookies: a Set-Cookie on one tenant's response would
+    # otherwise be sent with the next tenant's requests
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    
+    # All requests go to a single host, so one pool with room for bursty
+    # concurrent callers is enough. Only idempotent GETs are retried on
+    # 5xx/429; retrying a POST could deliver the same SMS twice. Retry-After
+    # is ignored so a throttled GET waits only the short backoff instead of
+    # whatever the server asks (urllib3 allows up to hours), possibly while
+    # the balance cache lock is held. The adapter also supplies the default
+    # timeout, so no request can hang forever.
+    adapter = _TimeoutHTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_maxsize,
+        pool_block=False,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Connection': 'keep-alive',
+        'User-Agent': USER_AGENT
+    })
+    return session
+
+
+def _parse_content(content: str) -> Dict[str, Any]:
+    """Parse the body of a Mitake API response"""
+    content = content.strip()
+    
+    # Handle different response formats
+    if content.startswith('[') and content.endswith(']'):
+        # Array format like [1]
+        return {'result': content}
+    
+    # Key-value format like "AccountPoint=1000"; each line is stripped of
+    # whitespace (including CR) and split on its first '='
+    if '=' in content:
+        result = {}
+        for line in content.split('\n'):
+            key, sep, value = line.strip().partition('=')
+            if sep:
+                result[key] = value
+        return result
+    
+    # Plain text response
+    return {'result': content}
+
+
+def _validate_batch(messages: List[Dict[str, str]]) -> None:
+    """Check a batch up front so the builders can index required keys directly"""
+    if not messages:
+        raise ValueError("Messages list cannot be empty")
+    
+    for i, msg in enumerate(messages):
+        if 'to' not in msg or 'message' not in msg:
+            raise ValueError(f"Message at index {i} must have 'to' and 'message' keys")
+
+
+def _batch_lines(messages: List[Dict[str, str]]) -> Iterator[str]:
+    """Yield one SmBulkSend line per (already validated) message dict"""
+    # Format: ClientID $$ dstaddr $$ dlvtime $$ vldtime $$ destname $$ response $$ smbody
+    # An f-string formats non-string values (e.g. an int message_id) the way
+    # the original implementation did instead of raising like str.join
+    for i, msg in enumerate(messages, 1):
+        yield (
+            f"{msg.get('message_id') or i}{SEP}{msg['to']}{SEP}"
+            f"{msg.get('send_time', '')}{SEP}{msg.get('valid_time', '')}{SEP}"
+            f"{msg.get('dest_name', '')}{SEP}{msg.get('callback_url', '')}{SEP}"
+            f"{msg['message']}"
+        )
+
+
+def _build_batch_data(messages: List[Dict[str, str]]) -> bytes:
+    """Build the UTF-8 encoded SmBulkSend request body from a list of message dicts"""
+    _validate_batch(messages)
+    
+    # Join the whole body as text and encode it in a single pass
+    return '\n'.join(_batch_lines(messages)).encode('utf-8')
+
+
+def _stream_batch_data(messages: List[Dict[str, str]]) -> Iterator[bytes]:
+    """Build the SmBulkSend request body as an iterator of UTF-8 encoded lines"""
+    # Validate everything before the upload starts; a bad message found while
+    # streaming would otherwise abort the request half way through the body.
+    # Besides the key check, every line is formatted and encoded once here
+    # (and discarded, so memory stays at one line) to catch values that
+    # cannot be sent, such as lone surrogates.
+    _validate_batch(messages)
+    for i, line in enumerate(_batch_lines(messages)):
+        try:
+            line.encode('utf-8')
+        except UnicodeEncodeError:
+            raise ValueError(f"Message at index {i} cannot be encoded as UTF-8")
+    
+    def _iter_bytes():
+        lines = _batch_lines(messages)
+        yield next(lines).encode('utf-8')
+        for line in lines:
+            yield ('\n' + line).encode('utf-8')
+    
+    return _iter_bytes()
+
+
+def get_session(
+    base_url: Optional[str] = None,
+    pool_maxsize: Optional[int] = None
+) -> requests.Session:
+    """
+    Return the process-wide session used by MitakeClient instances
+    
+    The session can be customised (proxies, extra adapters, headers) before or
+    after clients are created; every client with the same base_url (ignoring
+    a trailing slash) and pool_maxsize uses it.
+    
+    Args:
+        base_url: API base URL (defaults to https://smsapi.mitake.com.tw)
+        pool_maxsize: Connection pool size (defaults to 32 when None)
+    
+    Returns:
+        The shared requests.Session
+    """
+    key = (
+        (base_url or MitakeClient.DEFAULT_BASE_URL).rstrip('/'),
+        MitakeClient.DEFAULT_POOL_MAXSIZE if pool_maxsize is None else pool_maxsize
+    )
+    with _SESSIONS_LOCK:
+        if key not in _SHARED_SESSIONS:
+            _SHARED_SESSIONS[key] = _new_pooled_session(key[1])
+        return _SHARED_SESSIONS[key]
+
+
 class MitakeClient:
     """Mitake SMS API Client"""
     
     DEFAULT_BASE_URL = "https://smsapi.mitake.com.tw"
+    DEFAULT_POOL_MAXSIZE = 32
     
     def __init__(
         self, 
         username: Optional[str] = None, 
         password: Optional[str] = None,
-        base_url: Optional[str] = None
+        base_url: Optional[str] = None,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        balance_ttl: float = 0.0
     ):
         """
         Initialize Mitake SMS client
@@ -24,52 +220,123 @@ class MitakeClient:
             username: Mitake username (or set MITAKE_USERNAME env var)
             password: Mitake password (or set MITAKE_PASSWORD env var)
             base_url: API base URL (defaults to https://smsapi.mitake.com.tw)
+            pool_maxsize: Maximum number of keep-alive connections kept open
+                to the API host (defaults to 32)
+            balance_ttl: Seconds to reuse the last query_account_balance()
+                result before querying again (defaults to 0, no caching)
+        
+        Proxy settings from HTTP(S)_PROXY environment variables and .netrc are
+        not used; set ``client.session.proxies`` explicitly if a proxy is needed.
+        The REQUESTS_CA_BUNDLE and CURL_CA_BUNDLE variables are ignored too, so
+        behind a TLS-inspecting proxy point ``session.verify`` at the CA bundle,
+        e.g. ``get_session().verify = "/path/to/ca.pem"``.
         """
-        self.username = username or os.getenv('MITAKE_USERNAME')
-        self.password = password or os.getenv('MITAKE_PASSWORD')
+        self._username = username or os.getenv('MITAKE_USERNAME')
+        self._password = password or os.getenv('MITAKE_PASSWORD')
         self.base_url = base_url or self.DEFAULT_BASE_URL
+        self.balance_ttl = balance_ttl
         
-        if not self.username or not self.password:
+        if not self._username or not self._password:
             raise AuthenticationError(
                 "Username and password are required. "
                 "Set them via parameters or MITAKE_USERNAME/MITAKE_PASSWORD env vars."
             )
         
-        self.session = requests.Session()
+        self._encode_auth()
+        
+        # endpoint -> full URL without query string, built up front for the
+        # known endpoints; a trailing slash on base_url is tolerated
+        self._api_root = self.base_url.rstrip('/')
+        self._url_cache: Dict[str, str] = {
+            endpoint: f"{self._api_root}/{endpoint}" for endpoint in _ENDPOINTS
+        }
+        
+        self._balance_cache = (0.0, None)
+        self._balance_lock = threading.Lock()
+        
+        # Clients talking to the same host share one connection pool; auth is
+        # sent per request in the query string and the session keeps no
+        # cookies, so sharing is safe
+        self.session = get_session(self.base_url, pool_maxsize)
+    
+    @property
+    def username(self) -> str:
+        """Mitake username; assigning a new one applies to subsequent requests"""
+        return self._username
+    
+    @username.setter
+    def username(self, value: str) -> None:
+        self._username = value
+        self._credentials_changed()
+    
+    @property
+    def password(self) -> str:
+        """Mitake password; assigning a new one applies to subsequent requests"""
+        return self._password
+    
+    @password.setter
+    def password(self, value: str) -> None:
+        self._password = value
+        self._credentials_changed()
+    
+    def _encode_auth(self) -> None:
+        """Encode the auth query once per credential change instead of per request"""
+        self._auth_qs = urlencode({
+            'username': self._username,
+            'password': self._password
+        })
+    
+    def _credentials_changed(self) -> None:
+        self._encode_auth()
+        # A cached balance belongs to the previous account
+        with self._balance_lock:
+            self._balance_cache = (0.0, None)
     
     def _make_request(
         self, 
         endpoint: str, 
         method: str = "GET", 
         data: Optional[Any] = None,
-        params: Optional[Dict[str, Any]] = None
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
     ) -> requests.Response:
         """Make HTTP request to Mitake API"""
-        url = f"{self.base_url}/{endpoint}"
-        
-        # Add authentication to requests
-        if params is None:
-            params = {}
-        params.update({
-            'username': self.username,
-            'password': self.password
-        })
+        if method.upper() != "POST" and isinstance(data, dict):
+            # For GET requests, merge data into params
+            params = {**(params or {}), **data}
+        
+        # Add authentication to requests; only per-call params are encoded here
+        query = self._auth_qs
+        if params:
+            # Encode like requests does: list values repeat the key and
+            # None values are left out
+            params = {k: v for k, v in params.items() if v is not None}
+            if params:
+                query = f"{query}&{urlencode(params, doseq=True)}"
+        base = self._url_cache.get(endpoint)
+        if base is None:
+            base = self._url_cache[endpoint] = f"{self._api_root}/{endpoint}"
+        url = f"{base}?{query}"
         
         try:
             if method.upper() == "POST":
-                if isinstance(data, str):
-                    # For batch SMS, send as raw data
-                    response = self.session.post(url, data=data, params=params)
+                if isinstance(data, (str, bytes, Iterator)):
+                    # For batch SMS, send as raw data; an iterator is streamed
+                    # with chunked transfer encoding by requests
+                    response = self.session.post(url, data=data, headers=headers)
                 else:
                     # For regular requests, send as form data
                     if data is None:
                         data = {}
-                    response = self.session.post(url, data=data, params=params)
+                    response = self.session.post(url, data=data, headers=headers)
             else:
-                # For GET requests, merge data into params
-                if isinstance(data, dict):
-                    params.update(data)
-                response = self.session.get(url, params=params)
+                response = self.session.get(url)
+            
+            # A charset declared in Content-Type is honoured. Otherwise decode
+            # as UTF-8 (sends ask for it via CharsetURL/Encoding_PostIn, query
+            # replies are ASCII), which also skips requests' charset detection
+            if 'charset=' not in response.headers.get('Content-Type', '').lower():
+                response.encoding = 'utf-8'
             
             # Check for HTTP errors
             if response.status_code >= 400:
@@ -80,31 +347,13 @@ class MitakeClient:
                 )
             
             return response
-            
+        
         except requests.RequestException as e:
             raise MitakeError(f"Request failed: {str(e)}")
     
     def _parse_response(self, response: requests.Response) -> Dict[str, Any]:
         """Parse Mitake API response"""
-        content = response.text.strip()
-        
-        # Handle different response formats
-        if content.startswith('[') and content.endswith(']'):
-            # Array format like [1]
-            return {'result': content}
-        
-        # Key-value format like "AccountPoint=1000"
-        if '=' in content:
-            result = {}
-            for line in content.split('\n'):
-                line = line.strip()
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    result[key] = value
-            return result
-        
-        # Plain text response
-        return {'result': content}
+        return _parse_content(response.text)
     
     def send_sms(
         self, 
@@ -130,21 +379,20 @@ class MitakeClient:
             'smbody': message
         }
         
-        # Add UTF-8 encoding parameter by default
-        params = {
-            'CharsetURL': 'UTF8'
-        }
-        
         if message_id:
             data['msgid'] = message_id
         
         if send_time:
             data['dlvtime'] = send_time
         
-        response = self._make_request('api/mtk/SmSend', method='POST', data=data, params=params)
+        response = self._make_request(_EP_SEND, method='POST', data=data, params=_UTF8_CHARSET)
         return self._parse_response(response)
     
-    def send_batch_sms(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    def send_batch_sms(
+        self, 
+        messages: List[Dict[str, str]],
+        stream: bool = False
+    ) -> Dict[str, Any]:
         """
         Send multiple SMS messages
         
@@ -157,40 +405,20 @@ class MitakeClient:
                 - 'valid_time': Message valid time in YYYYMMDDHHMMSS format (optional)
                 - 'dest_name': Recipient name (optional)
                 - 'callback_url': Status callback URL (optional)
+            stream: Upload the batch with chunked transfer encoding instead of
+                building the whole body in memory first (for very large batches)
         
         Returns:
             Dict containing the API response
         """
-        if not messages:
-            raise ValueError("Messages list cannot be empty")
-        
-        # Build batch request data
-        # Format: ClientID $$ dstaddr $$ dlvtime $$ vldtime $$ destname $$ response $$ smbody
-        batch_lines = []
-        for i, msg in enumerate(messages, 1):
-            if 'to' not in msg or 'message' not in msg:
-                raise ValueError(f"Message at index {i-1} must have 'to' and 'message' keys")
-            
-            client_id = msg.get('message_id', str(i))
-            dstaddr = msg['to']
-            dlvtime = msg.get('send_time', '')
-            vldtime = msg.get('valid_time', '')
-            destname = msg.get('dest_name', '')
-            response = msg.get('callback_url', '')
-            smbody = msg['message']
-            
-            line = f"{client_id}$${dstaddr}$${dlvtime}$${vldtime}$${destname}$${response}$${smbody}"
-            batch_lines.append(line)
+        if stream:
+            batch_data = _stream_batch_data(messages)
+        else:
+            batch_data = _build_batch_data(messages)
         
-        # Join with newlines
-        batch_data = '\n'.join(batch_lines)
-        
-        # Add UTF-8 encoding parameter by default
-        params = {
-            'Encoding_PostIn': 'UTF8'
-        }
-        
-        response = self._make_request('api/mtk/SmBulkSend', method='POST', data=batch_data, params=params)
+        response = self._make_request(
+            _EP_BULK, method='POST', data=batch_data, params=_UTF8_POSTIN, headers=_BATCH_HEADERS
+        )
         return self._parse_response(response)
     
     def query_account_balance(self) -> Dict[str, Any]:
@@ -200,8 +428,20 @@ class MitakeClient:
         Returns:
             Dict containing account balance information
         """
-        response = self._make_request('api/mtk/SmQuery', method='GET')
-        return self._parse_response(response)
+        if self.balance_ttl <= 0:
+            response = self._make_request(_EP_QUERY, method='GET')
+            return self._parse_response(response)
+        
+        # Hold the lock across the request so concurrent callers share one query
+        with self._balance_lock:
+            ts, cached = self._balance_cache
+            if cached is not None and time.monotonic() - ts < self.balance_ttl:
+                return dict(cached)
+            
+            response = self._make_request(_EP_QUERY, method='GET')
+            result = self._parse_response(response)
+            self._balance_cache = (time.monotonic(), result)
+            return dict(result)
     
     def query_message_status(self, message_ids: List[str]) -> Dict[str, Any]:
         """
@@ -216,9 +456,10 @@ class MitakeClient:
         if not message_ids:
             raise ValueError("Message IDs list cannot be empty")
         
-        data = {
+        # str.join also rejects non-string IDs with a TypeError
+        params = {
             'msgid': ','.join(message_ids)
         }
         
-        response = self._make_request('api/mtk/SmQueryGet', method='GET', data=data)
+        response = self._make_request(_EP_QUERY_GET, method='GET', params=params)
         return self._parse_response(response)
\ No newline at end of file
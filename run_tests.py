@@ -7,11 +7,13 @@ Mitake SMS Python Library Test Runner
     python run_tests.py              # 執行所有測試
     python run_tests.py --verbose    # 執行詳細測試
     python run_tests.py --quick      # 執行快速測試
+    python run_tests.py --parallel   # 以 pytest-xdist 平行執行所有測試
     python run_tests.py --file test_client  # 執行特定檔案測試
 """
 
 import sys
 import os
+import importlib.util
 import unittest
 import argparse
 
@@ -41,7 +43,7 @@ def run_quick_tests():
     print("=" * 50)
     
     # 執行特定檔案的測試
-    patterns = ['test_client.py', 'test_sms.py', 'test_encoding.py']
+    patterns = ['test_client.py', 'test_encoding.py']
     
     for pattern in patterns:
         print(f"\n📝 執行 {pattern}...")
@@ -71,6 +73,31 @@ def run_all_tests():
     return success
 
 
+def run_parallel_tests():
+    """以 pytest-xdist 平行執行所有測試"""
+    if importlib.util.find_spec('pytest') is None or importlib.util.find_spec('xdist') is None:
+        print("⚠️ 未安裝 pytest-xdist（pip install -e .[test]），改為依序執行")
+        return run_all_tests()
+    
+    import pytest
+    
+    print("⚡ 平行執行三竹簡訊 Python 函式庫完整測試套件")
+    print("=" * 60)
+    
+    # 所有測試都以 mock 取代對外連線，彼此不共享狀態，可安全地分散到多個行程
+    tests_dir = os.path.join(os.path.dirname(__file__), 'tests')
+    exit_code = pytest.main(['-n', 'auto', '-p', 'no:cacheprovider', '-q', tests_dir])
+    success = exit_code == 0
+    
+    print("=" * 60)
+    if success:
+        print("✅ 所有測試通過！")
+    else:
+        print("❌ 測試失敗")
+    
+    return success
+
+
 def run_specific_test_file(filename):
     """執行特定測試檔案"""
     if not filename.startswith('test_'):
@@ -104,6 +131,7 @@ def main():
     parser.add_argument('--verbose', '-v', action='store_true', help='執行詳細測試')
     parser.add_argument('--quick', '-q', action='store_true', help='執行快速測試')
     parser.add_argument('--file', '-f', help='執行特定測試檔案')
+    parser.add_argument('--parallel', '-p', action='store_true', help='以 pytest-xdist 平行執行測試')
     
     args = parser.parse_args()
     
@@ -111,6 +139,8 @@ def main():
         success = run_specific_test_file(args.file)
     elif args.quick:
         success = run_quick_tests()
+    elif args.parallel:
+        success = run_parallel_tests()
     elif args.verbose:
         success = run_verbose_tests()
     else:
@@ -29,6 +29,10 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        "async": ["aiohttp>=3.8"],
+        "test": ["pytest", "pytest-xdist"],
+    },
     keywords="mitake sms api taiwan",
     project_urls={
         "Bug Reports": "https://github.com/tzangms/mitake/issues",
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+非同步客戶端測試
+Async Client Tests for Mitake SMS Python Library
+"""
+
+import unittest
+from unittest.mock import AsyncMock, patch
+import os
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mitake import AsyncMitakeClient, MitakeError, APIError
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+except ImportError:
+    web = None
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class TestAsyncHTTPRequests(unittest.IsolatedAsyncioTestCase):
+    """測試非同步 HTTP 請求功能"""
+    
+    async def asyncSetUp(self):
+        """啟動本機測試伺服器"""
+        self.requests = []
+        
+        async def handler(request):
+            self.requests.append((request.method, request.path, dict(request.query), await request.text()))
+            if request.path.endswith('error'):
+                return web.Response(status=400, text="Bad Request")
+            return web.Response(text="AccountPoint=1000")
+        
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+        
+        # 測試伺服器的網址以斜線結尾，客戶端應自行處理
+        base_url = str(self.server.make_url(''))
+        self.client = AsyncMitakeClient(username="test", password="secret", base_url=base_url)
+        await self.client.__aenter__()
+        self.addAsyncCleanup(self.client.close)
+    
+    async def test_query_account_balance(self):
+        """測試 GET 請求帶入帳號密碼"""
+        result = await self.client.query_account_balance()
+        
+        self.assertEqual(result, {'AccountPoint': '1000'})
+        method, path, query, _ = self.requests[0]
+        self.assertEqual(method, 'GET')
+        self.assertEqual(path, '/api/mtk/SmQuery')
+        self.assertEqual(query['username'], 'test')
+        self.assertEqual(query['password'], 'secret')
+    
+    async def test_credentials_reassigned(self):
+        """測試建立後修改帳號密碼，之後的請求會使用新值"""
+        self.client.username = "new_user"
+        self.client.password = "new_pass"
+        
+        await self.client.query_account_balance()
+        
+        _, _, query, _ = self.requests[0]
+        self.assertEqual(query['username'], 'new_user')
+        self.assertEqual(query['password'], 'new_pass')
+    
+    async def test_query_message_status(self):
+        """測試查詢簡訊狀態時 msgid 以逗號串接放在查詢字串"""
+        await self.client.query_message_status(["msg1", "msg2"])
+        
+        method, path, query, body = self.requests[0]
+        self.assertEqual(method, 'GET')
+        self.assertEqual(path, '/api/mtk/SmQueryGet')
+        self.assertEqual(query['msgid'], 'msg1,msg2')
+        self.assertEqual(body, '')
+    
+    async def test_send_batch_sms_body(self):
+        """測試批次發送的請求內容"""
+        await self.client.send_batch_sms([{"to": "0912345678", "message": "你好"}])
+        
+        method, path, query, body = self.requests[0]
+        self.assertEqual(method, 'POST')
+        self.assertEqual(query['Encoding_PostIn'], 'UTF8')
+        self.assertEqual(body, '1$$0912345678$$$$$$$$$$你好')
+    
+    async def test_http_error(self):
+        """測試 HTTP 錯誤處理"""
+        with self.assertRaises(APIError) as context:
+            await self.client._make_request('test/error')
+        
+        self.assertEqual(context.exception.status_code, 400)
+    
+    async def test_reenter_reuses_open_session(self):
+        """測試重複進入 async with 時沿用已開啟的 session，不會遺留未關閉的連線"""
+        session = self.client._session
+        
+        async with self.client:
+            self.assertIs(self.client._session, session)
+            await self.client.query_account_balance()
+        
+        self.assertTrue(session.closed)
+    
+    async def test_request_without_session(self):
+        """測試未開啟 session 時會拋出錯誤"""
+        client = AsyncMitakeClient(username="test", password="test")
+        
+        with self.assertRaises(MitakeError):
+            await client.query_account_balance()
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class TestAsyncSMS(unittest.IsolatedAsyncioTestCase):
+    """測試非同步簡訊發送功能"""
+    
+    def setUp(self):
+        """設定測試環境"""
+        self.client = AsyncMitakeClient(username="test", password="test")
+    
+    @patch.object(AsyncMitakeClient, '_make_request', new_callable=AsyncMock)
+    async def test_send_sms(self, mock_request):
+        """測試單筆簡訊發送"""
+        mock_request.return_value = "msgid=#000000013\nstatuscode=1"
+        
+        result = await self.client.send_sms("0912345678", "你好，我是小海！", message_id="msg123")
+        
+        args, kwargs = mock_request.call_args
+        self.assertEqual(args[0], 'api/mtk/SmSend')
+        self.assertEqual(kwargs['data']['msgid'], 'msg123')
+        self.assertEqual(kwargs['params']['CharsetURL'], 'UTF8')
+        self.assertEqual(result, {'msgid': '#000000013', 'statuscode': '1'})
+    
+    @patch.object(AsyncMitakeClient, '_make_request', new_callable=AsyncMock)
+    async def test_send_many(self, mock_request):
+        """測試同時發送多筆簡訊"""
+        mock_request.side_effect = ["msgid=1", "msgid=2"]
+        
+        results = await self.client.send_many([
+            {"to": "0912345678", "message": "第一則"},
+            {"to": "0987654321", "message": "第二則"}
+        ])
+        
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(results, [{'msgid': '1'}, {'msgid': '2'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,8 @@ UTF-8 Encoding Tests for Mitake SMS Python Library
 """
 
 import unittest
-from unittest.mock import Mock, patch
+from collections import namedtuple
+from unittest.mock import patch
 import os
 
 import sys
@@ -13,33 +14,23 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from mitake import MitakeClient
 
+# 測試用的輕量回應物件（只提供 status_code 與 text）
+_R = namedtuple('R', ['status_code', 'text'])
+OK = _R(200, 'Success')
+
 
 class TestUTF8Encoding(unittest.TestCase):
     """測試 UTF-8 編碼功能"""
     
-    def setUp(self):
-        """設定測試環境"""
-        self.client = MitakeClient(username="test", password="test")
-    
-    def test_chinese_message_encoding(self):
-        """測試中文訊息編碼"""
-        test_messages = [
-            "你好，我是小海！",
-            "測試中文簡訊 🎉",
-            "特殊符號測試：{}[]|^~",
-            "表情符號測試 😊 🌟 ❤️"
-        ]
-        
-        for message in test_messages:
-            # 測試 UTF-8 編碼是否正常
-            encoded = message.encode('utf-8')
-            decoded = encoded.decode('utf-8')
-            self.assertEqual(message, decoded, f"UTF-8 編碼測試失敗: {message}")
+    @classmethod
+    def setUpClass(cls):
+        """設定測試環境（整個類別共用一個客戶端）"""
+        cls.client = MitakeClient(username="test", password="test")
     
     @patch.object(MitakeClient, '_make_request')
     def test_utf8_parameter_in_single_sms(self, mock_request):
         """測試單筆簡訊包含 UTF-8 參數"""
-        mock_request.return_value = Mock()
+        mock_request.return_value = OK
         
         with patch.object(self.client, '_parse_response', return_value={}):
             self.client.send_sms("0912345678", "測試")
@@ -50,7 +41,7 @@ class TestUTF8Encoding(unittest.TestCase):
     @patch.object(MitakeClient, '_make_request')
     def test_utf8_parameter_in_batch_sms(self, mock_request):
         """測試批次簡訊包含 UTF-8 參數"""
-        mock_request.return_value = Mock()
+        mock_request.return_value = OK
         
         messages = [{"to": "0912345678", "message": "測試"}]
         
@@ -5,21 +5,48 @@ Complete Unit Tests for Mitake SMS Python Library
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from collections import namedtuple
+from unittest.mock import patch, MagicMock
 import requests
 import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs
 
-from mitake import MitakeClient, MitakeError, AuthenticationError, APIError
+from mitake import MitakeClient, MitakeError, AuthenticationError, APIError, get_session
+from mitake.client import DEFAULT_TIMEOUT
+
+# 測試用的輕量回應物件（只提供 status_code 與 text）
+_R = namedtuple('R', ['status_code', 'text'])
+OK = _R(200, 'Success')
+
+
+class _CookieHandler(BaseHTTPRequestHandler):
+    """記錄收到的 Cookie 標頭，並在每個回應加上 Set-Cookie"""
+    
+    def do_GET(self):
+        self.server.cookies.append(self.headers.get('Cookie'))
+        body = b'AccountPoint=1000'
+        self.send_response(200)
+        self.send_header('Set-Cookie', 'lb=tenant-a; Path=/')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
 
 
 class TestMitakeClient(unittest.TestCase):
     """測試 MitakeClient 類別"""
     
-    def setUp(self):
-        """設定測試環境"""
-        self.username = "test_user"
-        self.password = "test_pass"
-        self.client = MitakeClient(username=self.username, password=self.password)
+    @classmethod
+    def setUpClass(cls):
+        """設定測試環境（整個類別共用一個客戶端）"""
+        cls.username = "test_user"
+        cls.password = "test_pass"
+        cls.client = MitakeClient(username=cls.username, password=cls.password)
     
     def test_init_with_credentials(self):
         """測試使用帳號密碼初始化"""
@@ -40,6 +67,14 @@ class TestMitakeClient(unittest.TestCase):
         self.assertEqual(client.username, "env_user")
         self.assertEqual(client.password, "env_pass")
     
+    def test_env_vars_read_per_client(self):
+        """測試環境變數變更後，新建立的客戶端會讀到新值"""
+        with patch.dict('os.environ', {'MITAKE_USERNAME': 'first', 'MITAKE_PASSWORD': 'pass'}):
+            self.assertEqual(MitakeClient().username, "first")
+        
+        with patch.dict('os.environ', {'MITAKE_USERNAME': 'second', 'MITAKE_PASSWORD': 'pass'}):
+            self.assertEqual(MitakeClient().username, "second")
+    
     def test_custom_base_url(self):
         """測試自訂 API 網址"""
         custom_url = "https://custom.example.com"
@@ -49,69 +84,224 @@ class TestMitakeClient(unittest.TestCase):
             base_url=custom_url
         )
         self.assertEqual(client.base_url, custom_url)
+    
+    def test_session_connection_pool(self):
+        """測試連線池與重試設定"""
+        client = MitakeClient(username="user", password="pass", pool_maxsize=8)
+        adapter = client.session.get_adapter(MitakeClient.DEFAULT_BASE_URL)
+        
+        self.assertEqual(adapter._pool_maxsize, 8)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+        self.assertNotIn('POST', adapter.max_retries.allowed_methods)
+        self.assertFalse(adapter.max_retries.respect_retry_after_header)
+        self.assertEqual(client.session.headers['Connection'], 'keep-alive')
+        self.assertFalse(client.session.trust_env)
+    
+    def test_session_shared_per_base_url(self):
+        """測試相同 API 網址的客戶端共用連線池"""
+        client_a = MitakeClient(username="tenant_a", password="pass")
+        client_b = MitakeClient(username="tenant_b", password="pass")
+        client_c = MitakeClient(username="tenant_a", password="pass", base_url="https://custom.example.com")
+        
+        self.assertIs(client_a.session, client_b.session)
+        self.assertIsNot(client_a.session, client_c.session)
+        self.assertIs(get_session(), client_a.session)
+        self.assertIs(get_session("https://custom.example.com"), client_c.session)
+    
+    def test_session_key_normalised(self):
+        """測試結尾斜線不影響共用 session，且 pool_maxsize=0 不會被當成預設值"""
+        client_a = MitakeClient(username="user", password="pass", base_url="https://host.example.com")
+        client_b = MitakeClient(username="user", password="pass", base_url="https://host.example.com/")
+        
+        self.assertIs(client_a.session, client_b.session)
+        self.assertIs(get_session("https://host.example.com/"), client_a.session)
+        self.assertIsNot(get_session(pool_maxsize=0), get_session())
+    
+    def test_shared_session_keeps_no_cookies(self):
+        """測試共用 session 的客戶端之間不會互相帶到 Cookie"""
+        server = HTTPServer(('127.0.0.1', 0), _CookieHandler)
+        server.cookies = []
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        client_a = MitakeClient(username="tenant_a", password="pass", base_url=base_url)
+        client_b = MitakeClient(username="tenant_b", password="pass", base_url=base_url)
+        
+        client_a.query_account_balance()
+        client_b.query_account_balance()
+        
+        self.assertIs(client_a.session, client_b.session)
+        self.assertEqual(server.cookies, [None, None])
+        self.assertEqual(len(client_b.session.cookies), 0)
+
+
+def _adapter_response(status_code=200, text="Success", content_type=None, charset='utf-8'):
+    """建立在 HTTPAdapter 層回傳的 requests.Response"""
+    def send(request, **kwargs):
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = text.encode(charset)
+        if content_type is not None:
+            response.headers['Content-Type'] = content_type
+            response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.request = request
+        response.url = request.url
+        return response
+    return send
 
 
 class TestMitakeHTTPRequests(unittest.TestCase):
     """測試 HTTP 請求功能"""
     
+    @classmethod
+    def setUpClass(cls):
+        """設定測試環境（整個類別共用一個客戶端）"""
+        cls.client = MitakeClient(username="test", password="test")
+    
     def setUp(self):
-        """設定測試環境"""
-        self.client = MitakeClient(username="test", password="test")
+        """在 adapter 層攔截所有對外請求"""
+        patcher = patch('requests.adapters.HTTPAdapter.send', side_effect=_adapter_response())
+        self.mock_send = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def _sent_request(self):
+        """取得實際送出的 PreparedRequest"""
+        self.mock_send.assert_called_once()
+        return self.mock_send.call_args[0][0]
     
-    @patch('mitake.client.requests.Session.get')
-    def test_make_request_get(self, mock_get):
+    def test_make_request_get(self):
         """測試 GET 請求"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = "Success"
-        mock_get.return_value = mock_response
-        
         response = self.client._make_request('test/endpoint', method='GET')
         
-        mock_get.assert_called_once()
+        self.assertEqual(self._sent_request().method, 'GET')
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.encoding, 'utf-8')
     
-    @patch('mitake.client.requests.Session.post')
-    def test_make_request_post_with_dict_data(self, mock_post):
-        """測試 POST 請求（字典資料）"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = "Success"
-        mock_post.return_value = mock_response
+    def test_make_request_default_timeout(self):
+        """測試未指定逾時時套用預設的 (連線, 讀取) 逾時"""
+        self.client._make_request('test/endpoint', method='GET')
+        
+        self._sent_request()
+        self.assertEqual(self.mock_send.call_args[1]['timeout'], DEFAULT_TIMEOUT)
+    
+    def test_explicit_timeout_kept(self):
+        """測試呼叫端指定的逾時不會被預設值覆蓋"""
+        self.client.session.get(f"{MitakeClient.DEFAULT_BASE_URL}/test/endpoint", timeout=5)
+        
+        self._sent_request()
+        self.assertEqual(self.mock_send.call_args[1]['timeout'], 5)
+    
+    def test_adapter_send_positional_args(self):
+        """測試 adapter.send 的位置參數順序與 HTTPAdapter 相同"""
+        adapter = self.client.session.get_adapter(MitakeClient.DEFAULT_BASE_URL)
+        request = requests.Request('GET', f"{MitakeClient.DEFAULT_BASE_URL}/test/endpoint").prepare()
+        
+        adapter.send(request, False, 5)
+        
+        kwargs = self.mock_send.call_args[1]
+        self.assertEqual(kwargs['stream'], False)
+        self.assertEqual(kwargs['timeout'], 5)
+    
+    def test_make_request_keeps_declared_charset(self):
+        """測試伺服器在 Content-Type 宣告的編碼不會被 UTF-8 覆蓋"""
+        self.mock_send.side_effect = _adapter_response(
+            text="AccountPoint=一千", content_type='text/plain; charset=Big5', charset='big5'
+        )
+        
+        response = self.client._make_request('test/endpoint', method='GET')
+        
+        self.assertEqual(response.encoding, 'Big5')
+        self.assertEqual(response.text, "AccountPoint=一千")
+    
+    def test_make_request_defaults_to_utf8(self):
+        """測試未宣告編碼的 text/plain 回應以 UTF-8 解碼"""
+        self.mock_send.side_effect = _adapter_response(text="AccountPoint=一千", content_type='text/plain')
+        
+        response = self.client._make_request('test/endpoint', method='GET')
+        
+        self.assertEqual(response.encoding, 'utf-8')
+        self.assertEqual(response.text, "AccountPoint=一千")
+    
+    def test_make_request_adds_auth_params(self):
+        """測試帳號密碼加入參數且不修改呼叫端的字典"""
+        params = {'CharsetURL': 'UTF8'}
+        
+        self.client._make_request('test/endpoint', params=params)
+        
+        url, _, query = self._sent_request().url.partition('?')
+        self.assertEqual(url, f"{MitakeClient.DEFAULT_BASE_URL}/test/endpoint")
+        self.assertEqual(
+            parse_qs(query),
+            {'username': ['test'], 'password': ['test'], 'CharsetURL': ['UTF8']}
+        )
+        self.assertEqual(params, {'CharsetURL': 'UTF8'})
+    
+    def test_credentials_reassigned(self):
+        """測試建立後修改帳號密碼，之後的請求會使用新值"""
+        client = MitakeClient(username="old_user", password="old_pass")
+        client.username = "new_user"
+        client.password = "new_pass"
         
+        client._make_request('test/endpoint')
+        
+        query = parse_qs(self._sent_request().url.partition('?')[2])
+        self.assertEqual(query['username'], ['new_user'])
+        self.assertEqual(query['password'], ['new_pass'])
+    
+    def test_make_request_params_encoding(self):
+        """測試參數編碼與 requests 相同：串列重複鍵名、None 值省略"""
+        self.client._make_request('test/endpoint', params={'a': ['1', '2'], 'b': None})
+        
+        query = self._sent_request().url.partition('?')[2]
+        self.assertEqual(query, 'username=test&password=test&a=1&a=2')
+    
+    def test_trailing_slash_base_url(self):
+        """測試 base_url 結尾的斜線不會產生重複的斜線"""
+        client = MitakeClient(username="test", password="test", base_url="https://custom.example.com/")
+        
+        client.query_account_balance()
+        
+        url = self._sent_request().url.partition('?')[0]
+        self.assertEqual(url, "https://custom.example.com/api/mtk/SmQuery")
+    
+    def test_make_request_post_with_dict_data(self):
+        """測試 POST 請求（字典資料）"""
         response = self.client._make_request(
-            'test/endpoint', 
-            method='POST', 
+            'test/endpoint',
+            method='POST',
             data={'test': 'data'}
         )
         
-        mock_post.assert_called_once()
+        request = self._sent_request()
+        self.assertEqual(request.method, 'POST')
+        self.assertEqual(request.body, 'test=data')
         self.assertEqual(response.status_code, 200)
     
-    @patch('mitake.client.requests.Session.post')
-    def test_make_request_post_with_string_data(self, mock_post):
+    def test_make_request_post_with_string_data(self):
         """測試 POST 請求（字串資料，用於批次發送）"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = "Success"
-        mock_post.return_value = mock_response
-        
         response = self.client._make_request(
-            'test/endpoint', 
-            method='POST', 
+            'test/endpoint',
+            method='POST',
             data="test$$data$$format"
         )
         
-        mock_post.assert_called_once()
+        self.assertEqual(self._sent_request().body, "test$$data$$format")
         self.assertEqual(response.status_code, 200)
     
-    @patch('mitake.client.requests.Session.get')
-    def test_make_request_http_error(self, mock_get):
+    def test_send_batch_sms_stream_is_chunked(self):
+        """測試串流批次發送使用 chunked 傳輸"""
+        self.client.send_batch_sms([{"to": "0912345678", "message": "你好"}], stream=True)
+        
+        request = self._sent_request()
+        self.assertEqual(request.headers['Transfer-Encoding'], 'chunked')
+        self.assertEqual(request.headers['Content-Type'], 'text/plain; charset=utf-8')
+    
+    def test_make_request_http_error(self):
         """測試 HTTP 錯誤處理"""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = "Bad Request"
-        mock_get.return_value = mock_response
+        self.mock_send.side_effect = _adapter_response(400, "Bad Request")
         
         with self.assertRaises(APIError) as context:
             self.client._make_request('test/endpoint')
@@ -119,10 +309,9 @@ class TestMitakeHTTPRequests(unittest.TestCase):
         self.assertIn("HTTP 400", str(context.exception))
         self.assertEqual(context.exception.status_code, 400)
     
-    @patch('mitake.client.requests.Session.get')
-    def test_make_request_connection_error(self, mock_get):
+    def test_make_request_connection_error(self):
         """測試連線錯誤處理"""
-        mock_get.side_effect = requests.ConnectionError("Connection failed")
+        self.mock_send.side_effect = requests.ConnectionError("Connection failed")
         
         with self.assertRaises(MitakeError) as context:
             self.client._make_request('test/endpoint')
@@ -133,14 +322,14 @@ class TestMitakeHTTPRequests(unittest.TestCase):
 class TestResponseParsing(unittest.TestCase):
     """測試回應解析功能"""
     
-    def setUp(self):
-        """設定測試環境"""
-        self.client = MitakeClient(username="test", password="test")
+    @classmethod
+    def setUpClass(cls):
+        """設定測試環境（整個類別共用一個客戶端）"""
+        cls.client = MitakeClient(username="test", password="test")
     
     def test_parse_response_array_format(self):
         """測試解析陣列格式回應"""
-        mock_response = Mock()
-        mock_response.text = "[1]\nmsgid=#000000013\nstatuscode=1"
+        mock_response = _R(200, "[1]\nmsgid=#000000013\nstatuscode=1")
         
         result = self.client._parse_response(mock_response)
         # 實際上這個格式會被解析成 key-value 格式，因為包含 '=' 符號
@@ -149,16 +338,35 @@ class TestResponseParsing(unittest.TestCase):
     
     def test_parse_response_key_value_format(self):
         """測試解析 key-value 格式回應"""
-        mock_response = Mock()
-        mock_response.text = "AccountPoint=1000\nCredit=500"
+        mock_response = _R(200, "AccountPoint=1000\nCredit=500")
         
         result = self.client._parse_response(mock_response)
         self.assertEqual(result, {'AccountPoint': '1000', 'Credit': '500'})
     
+    def test_parse_response_crlf_lines(self):
+        """測試解析 CRLF 換行的回應"""
+        mock_response = _R(200, "[1]\r\nmsgid=#000000013\r\nstatuscode=1\r\nAccountPoint=98\r\n")
+        
+        result = self.client._parse_response(mock_response)
+        self.assertEqual(result, {'msgid': '#000000013', 'statuscode': '1', 'AccountPoint': '98'})
+    
+    def test_parse_response_value_with_equals(self):
+        """測試值中含有 '=' 時只以第一個 '=' 分割"""
+        mock_response = _R(200, "  Error=url=https://example.com/?a=1  \n")
+        
+        result = self.client._parse_response(mock_response)
+        self.assertEqual(result, {'Error': 'url=https://example.com/?a=1'})
+    
+    def test_parse_response_unicode_whitespace(self):
+        """測試行首尾的各種空白（含全形空白、\\x0b）與原本的 str.strip() 相同處理"""
+        mock_response = _R(200, "\u3000AccountPoint = 1000\x0b\n\x0bstatuscode=1\u3000\r\n\u3000\n")
+        
+        result = self.client._parse_response(mock_response)
+        self.assertEqual(result, {'AccountPoint ': ' 1000', 'statuscode': '1'})
+    
     def test_parse_response_plain_text(self):
         """測試解析純文字回應"""
-        mock_response = Mock()
-        mock_response.text = "Plain response"
+        mock_response = _R(200, "Plain response")
         
         result = self.client._parse_response(mock_response)
         self.assertEqual(result, {'result': 'Plain response'})
@@ -167,15 +375,16 @@ class TestResponseParsing(unittest.TestCase):
 class TestSingleSMS(unittest.TestCase):
     """測試單筆簡訊發送功能"""
     
-    def setUp(self):
-        """設定測試環境"""
-        self.client = MitakeClient(username="test", password="test")
+    @classmethod
+    def setUpClass(cls):
+        """設定測試環境（整個類別共用一個客戶端）"""
+        cls.client = MitakeClient(username="test", password="test")
     
     @patch.object(MitakeClient, '_make_request')
     @patch.object(MitakeClient, '_parse_response')
     def test_send_sms_basic(self, mock_parse, mock_request):
         """測試基本簡訊發送"""
-        mock_request.return_value = Mock()
+        mock_request.return_value = OK
         mock_parse.return_value = {'msgid': '#000000013', 'statuscode': '1'}
         
         result = self.client.send_sms("0912345678", "你好，我是小海！")
@@ -196,7 +405,7 @@ class TestSingleSMS(unittest.TestCase):
     @patch.object(MitakeClient, '_parse_response')
     def test_send_sms_with_options(self, mock_parse, mock_request):
         """測試帶選項參數的簡訊發送"""
-        mock_request.return_value = Mock()
+        mock_request.return_value = OK
         mock_parse.return_value = {'msgid': '#000000014', 'statuscode': '1'}
         
         result = self.client.send_sms(
@@ -209,20 +418,36 @@ class TestSingleSMS(unittest.TestCase):
         args, kwargs = mock_request.call_args
         self.assertEqual(kwargs['data']['msgid'], 'msg123')
         self.assertEqual(kwargs['data']['dlvtime'], '2024-12-31 23:59:00')
+    
+    @patch.object(MitakeClient, '_make_request')
+    @patch.object(MitakeClient, '_parse_response')
+    def test_send_sms_params_shared(self, mock_parse, mock_request):
+        """測試 UTF-8 參數在每次呼叫間共用且不可修改"""
+        mock_request.return_value = OK
+        
+        self.client.send_sms("0912345678", "第一則")
+        first = mock_request.call_args[1]['params']
+        self.client.send_sms("0987654321", "第二則")
+        second = mock_request.call_args[1]['params']
+        
+        self.assertIs(first, second)
+        with self.assertRaises(TypeError):
+            first['CharsetURL'] = 'BIG5'
 
 
 class TestBatchSMS(unittest.TestCase):
     """測試批次簡訊發送功能"""
     
-    def setUp(self):
-        """設定測試環境"""
-        self.client = MitakeClient(username="test", password="test")
+    @classmethod
+    def setUpClass(cls):
+        """設定測試環境（整個類別共用一個客戶端）"""
+        cls.client = MitakeClient(username="test", password="test")
     
     @patch.object(MitakeClient, '_make_request')
     @patch.object(MitakeClient, '_parse_response')
     def test_send_batch_sms_basic(self, mock_parse, mock_request):
         """測試基本批次發送"""
-        mock_request.return_value = Mock()
+        mock_request.return_value = OK
         mock_parse.return_value = {'result': '[2]'}
         
         messages = [
@@ -239,10 +464,10 @@ class TestBatchSMS(unittest.TestCase):
         
         # 檢查批次格式
         batch_data = kwargs['data']
-        self.assertIsInstance(batch_data, str)
-        self.assertIn('0912345678', batch_data)
-        self.assertIn('你好！這是第一則訊息', batch_data)
-        self.assertIn('msg2', batch_data)
+        self.assertIsInstance(batch_data, bytes)
+        self.assertIn(b'0912345678', batch_data)
+        self.assertIn('你好！這是第一則訊息'.encode('utf-8'), batch_data)
+        self.assertIn(b'msg2', batch_data)
         
         # 檢查 UTF-8 編碼參數
         self.assertEqual(kwargs['params']['Encoding_PostIn'], 'UTF8')
@@ -251,7 +476,7 @@ class TestBatchSMS(unittest.TestCase):
     @patch.object(MitakeClient, '_parse_response')
     def test_send_batch_sms_full_options(self, mock_parse, mock_request):
         """測試完整參數的批次發送"""
-        mock_request.return_value = Mock()
+        mock_request.return_value = OK
         mock_parse.return_value = {'result': '[1]'}
         
         messages = [{
@@ -267,7 +492,7 @@ class TestBatchSMS(unittest.TestCase):
         result = self.client.send_batch_sms(messages)
         
         args, kwargs = mock_request.call_args
-        batch_data = kwargs['data']
+        batch_data = kwargs['data'].decode('utf-8')
         
         # 檢查批次格式包含所有參數
         self.assertIn('full_test', batch_data)
@@ -278,6 +503,88 @@ class TestBatchSMS(unittest.TestCase):
         self.assertIn('https://example.com/callback', batch_data)
         self.assertIn('完整參數測試', batch_data)
     
+    @patch.object(MitakeClient, '_make_request')
+    @patch.object(MitakeClient, '_parse_response')
+    def test_send_batch_sms_mixed_options(self, mock_parse, mock_request):
+        """測試部分欄位省略時的批次格式（空白 message_id 以序號代替）"""
+        mock_request.return_value = OK
+        
+        messages = [
+            {"to": "0912345678", "message": "第一則", "message_id": ""},
+            {"to": "0987654321", "message": "第二則", "dest_name": "小海"},
+            {"to": "0966666666", "message": "第三則", "message_id": "m3", "send_time": "20241231235900"}
+        ]
+        
+        self.client.send_batch_sms(messages)
+        
+        args, kwargs = mock_request.call_args
+        self.assertEqual(kwargs['data'].decode('utf-8').split('\n'), [
+            '1$$0912345678$$$$$$$$$$第一則',
+            '2$$0987654321$$$$$$小海$$$$第二則',
+            'm3$$0966666666$$20241231235900$$$$$$$$第三則'
+        ])
+    
+    @patch.object(MitakeClient, '_make_request')
+    @patch.object(MitakeClient, '_parse_response')
+    def test_send_batch_sms_stream(self, mock_parse, mock_request):
+        """測試串流上傳批次內容"""
+        mock_request.return_value = OK
+        mock_parse.return_value = {'result': '[2]'}
+        
+        messages = [
+            {"to": "0912345678", "message": "第一則"},
+            {"to": "0987654321", "message": "第二則", "message_id": "msg2"}
+        ]
+        
+        self.client.send_batch_sms(messages, stream=True)
+        
+        args, kwargs = mock_request.call_args
+        self.assertNotIsInstance(kwargs['data'], (str, bytes))
+        self.assertEqual(
+            b''.join(kwargs['data']).decode('utf-8'),
+            "1$$0912345678$$$$$$$$$$第一則\nmsg2$$0987654321$$$$$$$$$$第二則"
+        )
+        self.assertEqual(kwargs['headers']['Content-Type'], 'text/plain; charset=utf-8')
+    
+    @patch.object(MitakeClient, '_make_request')
+    def test_send_batch_sms_stream_non_str_field(self, mock_request):
+        """測試串流上傳時後面訊息的非字串欄位不會中斷上傳"""
+        mock_request.return_value = OK
+        messages = [
+            {"to": "0912345678", "message": "第一則"},
+            {"to": "0987654321", "message": "第二則", "message_id": 2, "send_time": 20241231235900}
+        ]
+        
+        with patch.object(self.client, '_parse_response', return_value={}):
+            self.client.send_batch_sms(messages, stream=True)
+        
+        args, kwargs = mock_request.call_args
+        self.assertEqual(
+            b''.join(kwargs['data']).decode('utf-8'),
+            "1$$0912345678$$$$$$$$$$第一則\n2$$0987654321$$20241231235900$$$$$$$$第二則"
+        )
+    
+    @patch.object(MitakeClient, '_make_request')
+    def test_send_batch_sms_stream_unencodable_message(self, mock_request):
+        """測試無法以 UTF-8 編碼的訊息在上傳前就被拒絕"""
+        messages = [{"to": "0912345678", "message": "第一則"}, {"to": "0987654321", "message": "\ud800"}]
+        
+        with self.assertRaises(ValueError) as context:
+            self.client.send_batch_sms(messages, stream=True)
+        
+        self.assertIn("index 1", str(context.exception))
+        mock_request.assert_not_called()
+    
+    @patch.object(MitakeClient, '_make_request')
+    def test_send_batch_sms_stream_invalid_message(self, mock_request):
+        """測試串流上傳前先驗證訊息格式"""
+        messages = [{"to": "0912345678", "message": "第一則"}, {"to": "0987654321"}]
+        
+        with self.assertRaises(ValueError):
+            self.client.send_batch_sms(messages, stream=True)
+        
+        mock_request.assert_not_called()
+    
     def test_send_batch_sms_empty_list(self):
         """測試空清單會拋出錯誤"""
         with self.assertRaises(ValueError):
@@ -291,20 +598,41 @@ class TestBatchSMS(unittest.TestCase):
             self.client.send_batch_sms(messages)
         
         self.assertIn("must have 'to' and 'message' keys", str(context.exception))
+    
+    @patch.object(MitakeClient, '_make_request')
+    def test_send_batch_sms_non_str_fields(self, mock_request):
+        """測試非字串欄位（如整數 message_id）會轉為字串"""
+        mock_request.return_value = OK
+        
+        with patch.object(self.client, '_parse_response', return_value={}):
+            self.client.send_batch_sms([{"to": 912345678, "message": "你好", "message_id": 5}])
+        
+        args, kwargs = mock_request.call_args
+        self.assertEqual(kwargs['data'].decode('utf-8'), '5$$912345678$$$$$$$$$$你好')
+    
+    def test_send_batch_sms_invalid_message_index(self):
+        """測試錯誤訊息指出無效訊息的位置"""
+        messages = [{"to": "0912345678", "message": "第一則"}, {"message": "第二則"}]
+        
+        with self.assertRaises(ValueError) as context:
+            self.client.send_batch_sms(messages)
+        
+        self.assertIn("index 1", str(context.exception))
 
 
 class TestQueryFunctions(unittest.TestCase):
     """測試查詢功能"""
     
-    def setUp(self):
-        """設定測試環境"""
-        self.client = MitakeClient(username="test", password="test")
+    @classmethod
+    def setUpClass(cls):
+        """設定測試環境（整個類別共用一個客戶端）"""
+        cls.client = MitakeClient(username="test", password="test")
     
     @patch.object(MitakeClient, '_make_request')
     @patch.object(MitakeClient, '_parse_response')
     def test_query_account_balance(self, mock_parse, mock_request):
         """測試查詢帳戶餘額"""
-        mock_request.return_value = Mock()
+        mock_request.return_value = OK
         mock_parse.return_value = {'AccountPoint': '1000'}
         
         result = self.client.query_account_balance()
@@ -312,11 +640,46 @@ class TestQueryFunctions(unittest.TestCase):
         mock_request.assert_called_once_with('api/mtk/SmQuery', method='GET')
         self.assertEqual(result, {'AccountPoint': '1000'})
     
+    @patch('mitake.client.time.monotonic')
+    @patch.object(MitakeClient, '_make_request')
+    @patch.object(MitakeClient, '_parse_response')
+    def test_query_account_balance_ttl_cache(self, mock_parse, mock_request, mock_monotonic):
+        """測試帳戶餘額查詢快取"""
+        mock_request.return_value = OK
+        mock_parse.return_value = {'AccountPoint': '1000'}
+        client = MitakeClient(username="test", password="test", balance_ttl=5)
+        
+        mock_monotonic.return_value = 100.0
+        self.assertEqual(client.query_account_balance(), {'AccountPoint': '1000'})
+        mock_monotonic.return_value = 104.0
+        self.assertEqual(client.query_account_balance(), {'AccountPoint': '1000'})
+        self.assertEqual(mock_request.call_count, 1)
+        
+        # 超過 TTL 後重新查詢
+        mock_monotonic.return_value = 106.0
+        client.query_account_balance()
+        self.assertEqual(mock_request.call_count, 2)
+    
+    @patch('mitake.client.time.monotonic', return_value=100.0)
+    @patch.object(MitakeClient, '_make_request')
+    @patch.object(MitakeClient, '_parse_response')
+    def test_balance_cache_cleared_on_new_credentials(self, mock_parse, mock_request, mock_monotonic):
+        """測試更換帳號後不會回傳舊帳號快取的餘額"""
+        mock_request.return_value = OK
+        mock_parse.side_effect = [{'AccountPoint': '1000'}, {'AccountPoint': '5'}]
+        client = MitakeClient(username="test", password="test", balance_ttl=5)
+        
+        client.query_account_balance()
+        client.username = "other"
+        
+        self.assertEqual(client.query_account_balance(), {'AccountPoint': '5'})
+        self.assertEqual(mock_request.call_count, 2)
+    
     @patch.object(MitakeClient, '_make_request')
     @patch.object(MitakeClient, '_parse_response')
     def test_query_message_status(self, mock_parse, mock_request):
         """測試查詢訊息狀態"""
-        mock_request.return_value = Mock()
+        mock_request.return_value = OK
         mock_parse.return_value = {'status': 'delivered'}
         
         result = self.client.query_message_status(["msg1", "msg2"])
@@ -324,8 +687,7 @@ class TestQueryFunctions(unittest.TestCase):
         args, kwargs = mock_request.call_args
         self.assertEqual(args[0], 'api/mtk/SmQueryGet')
         self.assertEqual(kwargs['method'], 'GET')
-        # 修正：現在參數在 params 中，不是 data 中
-        # self.assertEqual(kwargs['data']['msgid'], 'msg1,msg2')
+        self.assertEqual(kwargs['params']['msgid'], 'msg1,msg2')
         self.assertEqual(result, {'status': 'delivered'})
     
     def test_query_message_status_empty_list(self):
@@ -337,29 +699,26 @@ class TestQueryFunctions(unittest.TestCase):
 class TestUTF8Encoding(unittest.TestCase):
     """測試 UTF-8 編碼功能"""
     
-    def setUp(self):
-        """設定測試環境"""
-        self.client = MitakeClient(username="test", password="test")
-    
-    def test_chinese_message_encoding(self):
-        """測試中文訊息編碼"""
-        test_messages = [
-            "你好，我是小海！",
-            "測試中文簡訊 🎉",
-            "特殊符號測試：{}[]|^~",
-            "表情符號測試 😊 🌟 ❤️"
-        ]
+    @classmethod
+    def setUpClass(cls):
+        """設定測試環境（整個類別共用一個客戶端）"""
+        cls.client = MitakeClient(username="test", password="test")
+    
+    @patch.object(MitakeClient, '_make_request')
+    def test_batch_body_utf8_bytes(self, mock_request):
+        """測試批次內容以 UTF-8 位元組送出"""
+        mock_request.return_value = OK
+        
+        with patch.object(self.client, '_parse_response', return_value={}):
+            self.client.send_batch_sms([{"to": "0912345678", "message": "你好"}])
         
-        for message in test_messages:
-            # 測試 UTF-8 編碼是否正常
-            encoded = message.encode('utf-8')
-            decoded = encoded.decode('utf-8')
-            self.assertEqual(message, decoded, f"UTF-8 編碼測試失敗: {message}")
+        args, kwargs = mock_request.call_args
+        self.assertEqual(kwargs['data'], b'1$$0912345678$$$$$$$$$$\xe4\xbd\xa0\xe5\xa5\xbd')
     
     @patch.object(MitakeClient, '_make_request')
     def test_utf8_parameter_in_single_sms(self, mock_request):
         """測試單筆簡訊包含 UTF-8 參數"""
-        mock_request.return_value = Mock()
+        mock_request.return_value = OK
         
         with patch.object(self.client, '_parse_response', return_value={}):
             self.client.send_sms("0912345678", "測試")
@@ -370,7 +729,7 @@ class TestUTF8Encoding(unittest.TestCase):
     @patch.object(MitakeClient, '_make_request')
     def test_utf8_parameter_in_batch_sms(self, mock_request):
         """測試批次簡訊包含 UTF-8 參數"""
-        mock_request.return_value = Mock()
+        mock_request.return_value = OK
         
         messages = [{"to": "0912345678", "message": "測試"}]
         
@@ -407,9 +766,10 @@ class TestErrorHandling(unittest.TestCase):
 class TestIntegration(unittest.TestCase):
     """整合測試"""
     
-    def setUp(self):
-        """設定測試環境"""
-        self.client = MitakeClient(username="test", password="test")
+    @classmethod
+    def setUpClass(cls):
+        """設定測試環境（整個類別共用一個客戶端）"""
+        cls.client = MitakeClient(username="test", password="test")
     
     def test_batch_message_format_generation(self):
         """測試批次訊息格式生成"""
@@ -425,21 +785,16 @@ class TestIntegration(unittest.TestCase):
             }
         ]
         
-        # 模擬批次格式生成
-        batch_lines = []
-        for i, msg in enumerate(messages, 1):
-            client_id = msg.get('message_id', str(i))
-            dstaddr = msg['to']
-            dlvtime = msg.get('send_time', '')
-            vldtime = msg.get('valid_time', '')
-            destname = msg.get('dest_name', '')
-            response = msg.get('callback_url', '')
-            smbody = msg['message']
-            
-            line = f"{client_id}$${dstaddr}$${dlvtime}$${vldtime}$${destname}$${response}$${smbody}"
-            batch_lines.append(line)
-        
-        batch_data = '\n'.join(batch_lines)
+        # 透過客戶端產生批次內容（一般與串流兩種方式）
+        with patch.object(MitakeClient, '_make_request') as mock_request, \
+                patch.object(MitakeClient, '_parse_response', return_value={}):
+            self.client.send_batch_sms(messages)
+            batch_body = mock_request.call_args[1]['data']
+            self.client.send_batch_sms(messages, stream=True)
+            streamed_body = b''.join(mock_request.call_args[1]['data'])
+        
+        self.assertEqual(streamed_body, batch_body)
+        batch_data = batch_body.decode('utf-8')
         
         # 驗證格式
         lines = batch_data.split('\n')
@@ -464,25 +819,8 @@ def run_all_tests():
     print("🧪 開始執行三竹簡訊 Python 函式庫完整測試套件")
     print("=" * 60)
     
-    # 建立測試套件
-    test_suite = unittest.TestSuite()
-    
-    # 加入所有測試類別
-    test_classes = [
-        TestMitakeClient,
-        TestMitakeHTTPRequests,
-        TestResponseParsing,
-        TestSingleSMS,
-        TestBatchSMS,
-        TestQueryFunctions,
-        TestUTF8Encoding,
-        TestErrorHandling,
-        TestIntegration
-    ]
-    
-    for test_class in test_classes:
-        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
-        test_suite.addTests(tests)
+    # 建立測試套件（一次載入本模組內所有測試類別）
+    test_suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
     
     # 執行測試
     runner = unittest.TextTestRunner(verbosity=2)